@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# python3 version v3.12.2 via conda
+import math
+import numpy as np
+
+# Flags unusual expenses as they come in. Every category keeps a fixed
+# amount of state no matter how many transactions it has seen:
+#   - running mean/variance (Welford's algorithm)
+#   - a running high quantile (the P-square algorithm, 5 markers)
+# so scoring a new transaction is O(1).
+
+
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        # sum of squared differences from the mean
+        self.m2 = 0.0
+
+    # Add one value (Welford's update)
+    def push(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    # Add many values at once by merging their stats with ours (Chan et al.)
+    def push_many(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        count = values.size
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+
+    def get_variance(self):
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def get_std(self):
+        return math.sqrt(self.get_variance())
+
+
+class P2Quantile:
+    '''
+        Estimate one quantile of a stream without storing it
+        (Jain & Chlamtac, "The P-square algorithm", 1985)
+    '''
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        # marker heights, actual positions and desired positions
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2*p, 1 + 4*p, 3 + 2*p, 5]
+        self.increments = [0, p/2, p, (1 + p)/2, 1]
+
+    def push(self, value):
+        self.count += 1
+        if self.count <= 5:
+            self.heights.append(value)
+            self.heights.sort()
+            return
+
+        q = self.heights
+        n = self.positions
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # move the middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self.parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def parabolic(self, i, d):
+        q = self.heights
+        n = self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    # Get the current estimate (exact while fewer than 5 values were seen)
+    def get_value(self):
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            return float(np.quantile(self.heights, self.p))
+        return self.heights[2]
+
+
+class CategoryStats:
+    def __init__(self, quantile):
+        self.stats = RunningStats()
+        self.quantile = P2Quantile(quantile)
+
+
+class AnomalyDetector:
+    def __init__(self, z_threshold=3.0, quantile=0.99, min_samples=10, quantile_min_samples=50,
+                 quantile_z_threshold=2.5, relative_tolerance=0.05):
+        self.z_threshold = z_threshold
+        self.quantile = quantile
+        # don't flag anything until a category has some history
+        self.min_samples = min_samples
+        # a high quantile estimated from a short history sits close to the
+        # largest value seen, so only compare against it once there is some,
+        # and only flag amounts above it that are also fairly far from the mean
+        self.quantile_min_samples = quantile_min_samples
+        self.quantile_z_threshold = quantile_z_threshold
+        # for fixed charges (rent, subscriptions) the spread is zero or close
+        # to it; anything more than this fraction above the mean is flagged
+        self.relative_tolerance = relative_tolerance
+        self.categories = {}
+
+    def get_category(self, category):
+        if category not in self.categories:
+            self.categories[category] = CategoryStats(self.quantile)
+        return self.categories[category]
+
+    # z-scores with the spread floored so that going relative_tolerance above
+    # the mean is exactly z_threshold (works on floats and arrays)
+    def z_scores(self, amounts, means, stds):
+        floor = self.relative_tolerance * np.maximum(np.abs(means), 1.0) / self.z_threshold
+        return (amounts - means) / np.maximum(stds, floor)
+
+    def is_unusual(self, amounts, z_scores, limit):
+        unusual = z_scores > self.z_threshold
+        if limit is not None:
+            unusual = unusual | ((amounts > limit) & (z_scores > self.quantile_z_threshold))
+        return unusual
+
+    '''
+        Score an amount against what the category has seen so far
+        Returns: z-score (0.0 while the category has too little history)
+    '''
+    def score(self, category, amount):
+        stats = self.get_category(category).stats
+        if stats.count < self.min_samples:
+            return 0.0
+        return float(self.z_scores(amount, stats.mean, stats.get_std()))
+
+    '''
+        Score a new expense, then add it to the category's stats
+        Returns: alert dict if the expense is unusual, otherwise None
+    '''
+    def observe(self, category, amount):
+        entry = self.get_category(category)
+        z = self.score(category, amount)
+        limit = self.get_limit(entry)
+        alert = None
+        if entry.stats.count >= self.min_samples and self.is_unusual(amount, z, limit):
+            alert = {'category': category, 'amount': amount, 'z_score': z,
+                     'mean': entry.stats.mean, 'quantile': limit}
+        entry.stats.push(amount)
+        entry.quantile.push(amount)
+        return alert
+
+    # Get the quantile an expense must stay under, once there is enough history
+    def get_limit(self, entry):
+        if entry.stats.count < self.quantile_min_samples:
+            return None
+        return entry.quantile.get_value()
+
+    # Score many amounts at once against the current stats (no update)
+    def score_batch(self, category, amounts):
+        amounts = np.asarray(amounts, dtype=float)
+        stats = self.get_category(category).stats
+        if stats.count < self.min_samples:
+            return np.zeros_like(amounts)
+        return self.z_scores(amounts, stats.mean, stats.get_std())
+
+    '''
+        Load a category's history (e.g. an imported statement) and flag the
+        unusual amounts in it. Each amount is judged against everything else
+        (earlier stats plus the rest of the batch), so an outlier doesn't
+        raise the mean and spread it is compared with.
+        Returns: list of alert dicts
+    '''
+    def import_history(self, category, amounts):
+        amounts = np.asarray(amounts, dtype=float)
+        entry = self.get_category(category)
+        stats = entry.stats
+        stats.push_many(amounts)
+        # P-square has to see the values one at a time
+        for amount in amounts:
+            entry.quantile.push(float(amount))
+
+        # leave-one-out mean and variance for every amount (Welford, reversed)
+        count = stats.count - 1
+        if count < self.min_samples:
+            return []
+        means = (stats.mean * stats.count - amounts) / count
+        m2 = stats.m2 - (amounts - stats.mean) * (amounts - means)
+        stds = np.sqrt(np.clip(m2, 0, None) / max(count - 1, 1))
+        z_scores = self.z_scores(amounts, means, stds)
+
+        limit = self.get_limit(entry)
+        flagged = self.is_unusual(amounts, z_scores, limit)
+        return [{'category': category, 'amount': float(amounts[i]), 'z_score': float(z_scores[i]),
+                 'mean': float(means[i]), 'quantile': limit}
+                for i in np.flatnonzero(flagged)]
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 # python3 version v3.12.2 via conda
 import matplotlib.pyplot as plt
+from datetime import date
+from rollups import RollupCube
+from anomaly import AnomalyDetector
+from simulator import baseline_from_rollups, simulate
 # from writing import write_transactions_to_csv, view_transactions_from_csv
 # import writing
 
@@ -16,6 +20,11 @@ class BudgetTracker:
         # for now the transaction value only is added to this list
         # will add feature later to categorize transactions by user input
         self.each_transaction = []
+        # day/week/month/year totals per category and account
+        self.rollups = RollupCube()
+        # per-category stats used to flag unusual expenses as they are added
+        self.detector = AnomalyDetector()
+        self.alerts = []
 
     # Add a transaction
     def add_one_tx(self):
@@ -50,29 +59,67 @@ class BudgetTracker:
         print("Total expenses entered:", self.get_tx_count())
         self.view_budget()
 
-    def add_income(self, amount):
+    def add_income(self, amount, category='Income', day=None, account='default'):
         self.income += amount
         self.add_one_deposit()
         self.each_transaction.append(amount)
+        self.rollups.add(amount, 'income', day or date.today(), category, account)
         # writing.write_transactions_to_csv(self.filename, amount) 
         print("Current number of deposits added:", self.get_deposit_count())
         print(f"Added income: {amount:.2f}")
 
     # Add an expense and update the transactions count
     # Multiply by -1 to show expense as taking away from added income 
-    def add_expense(self, amount):
+    def add_expense(self, amount, category='Other', day=None, account='default'):
         self.expenses += amount
         self.add_one_tx()
         self.each_transaction.append(-1*amount)
+        self.rollups.add(amount, 'expense', day or date.today(), category, account)
         # writing.write_transactions_to_csv(self.filename, -1*amount)
         print(f"Added expense: {amount:.2f}")
+        alert = self.detector.observe(category, amount)
+        if alert is not None:
+            self.alerts.append(alert)
+            print(f"Warning: unusual {category} expense of {amount:.2f} "
+                  f"(average is {alert['mean']:.2f})")
+
+    '''
+        Add past expenses of one category in one go, e.g. from a bank statement
+        expenses: list of (date, amount) pairs
+        Returns: alerts for the unusual expenses among them
+    '''
+    def import_expenses(self, expenses, category='Other', account='default'):
+        steps = []
+        for day, amount in expenses:
+            steps += self.rollups.changes(amount, 'expense', day, category, account, 1)
+        # update the rollups first, they raise before changing anything
+        self.rollups.apply(steps)
+        amounts = [amount for _, amount in expenses]
+        self.expenses += sum(amounts)
+        self.tx_count += len(amounts)
+        self.each_transaction.extend(-1*amount for amount in amounts)
+        alerts = self.detector.import_history(category, amounts)
+        self.alerts.extend(alerts)
+        print(f"Imported {len(amounts)} {category} expenses, {len(alerts)} flagged as unusual")
+        return alerts
+
+    # Get the expenses that were flagged as unusual
+    def get_alerts(self):
+        return self.alerts
         
     # Remove an expense in event of error
-    def remove_expense(self, amount):
+    # The category and date should match the ones the expense was added with
+    def remove_expense(self, amount, category='Other', day=None, account='default'):
         if self.expenses <= 0 and self.tx_count <= 0:
             print("No expenses to remove. Must have at least one expense recorded.")
             return
         else:
+            day = day or date.today()
+            try:
+                self.rollups.remove(amount, 'expense', day, category, account)
+            except ValueError:
+                print(f"No {category} expense recorded on {day} to remove.")
+                return
             print(f"Current expenses before removal: {self.expenses:.2f}")
             self.expenses -= amount
             self.subtract_one_tx()
@@ -90,6 +137,20 @@ class BudgetTracker:
         print(f"Total Expenses: {self.expenses:.2f}")
         print(f"Current Balance: {balance:.2f}")
 
+    '''
+        Project the balance forward under a what-if scenario
+        e.g. adjustments={'Food': -0.20, 'Bills': 0.05}
+        Returns: dict with percentile bands of the balance for every month
+    '''
+    def simulate_budget(self, adjustments=None, months=12, paths=5000):
+        # the current month isn't over yet, only use the months before it
+        today = date.today()
+        last_month = f'{today.year - 1}-12' if today.month == 1 else f'{today.year}-{today.month - 1:02d}'
+        baseline = baseline_from_rollups(self.rollups, end=last_month)
+        result = simulate(baseline, adjustments, self.income - self.expenses, months, paths)
+        print(f"Median balance after {months} months: {result['final_median']:.2f}")
+        print(f"Chance of a negative balance: {result['chance_negative']:.0%}")
+        return result
 
     '''
         Visualize the budget using a bar chart
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# python3 version v3.12.2 via conda
+import json
+from datetime import date
+
+# Precomputed day -> week -> month -> year totals per category and account.
+# Each transaction touches one cell per level when it is added, so trend
+# charts and year-over-year comparisons read a handful of cells instead of
+# scanning every transaction.
+
+LEVELS = ('day', 'week', 'month', 'year')
+
+# Cells are also kept for "all categories" / "all accounts" so totals
+# don't have to be summed at query time
+ALL = '*'
+
+# rounding slack when checking that totals don't go below zero
+TOLERANCE = 1e-9
+
+
+# Get the period key of a date for every level, e.g.
+# {'day': '2026-01-17', 'week': '2026-W03', 'month': '2026-01', 'year': '2026'}
+def period_keys(day):
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    iso_year, iso_week, _ = day.isocalendar()
+    return {
+        'day': day.isoformat(),
+        'week': f'{iso_year}-W{iso_week:02d}',
+        'month': f'{day.year}-{day.month:02d}',
+        'year': str(day.year),
+    }
+
+
+class RollupCube:
+    def __init__(self):
+        # (level, period, category, account) -> [income, expenses, count]
+        self.cells = {}
+
+    # Add a transaction to every level it belongs to
+    def add(self, amount, tx_type, day, category, account='default'):
+        self.apply(self.changes(amount, tx_type, day, category, account, 1))
+
+    # Take a transaction back out, e.g. when it is deleted or edited
+    # Raises ValueError if more than was recorded would be taken out
+    def remove(self, amount, tx_type, day, category, account='default'):
+        self.apply(self.changes(amount, tx_type, day, category, account, -1))
+
+    # Swap one transaction record for another, as used by the React prototype
+    # ({'amount', 'type', 'date', 'category', 'account'?}); either can be None.
+    # Nothing is changed unless both records are valid.
+    def replace_record(self, old, new):
+        steps = []
+        if old is not None:
+            steps += self.record_changes(old, -1)
+        if new is not None:
+            steps += self.record_changes(new, 1)
+        self.apply(steps)
+
+    def add_record(self, record):
+        self.replace_record(None, record)
+
+    def remove_record(self, record):
+        self.replace_record(record, None)
+
+    def record_changes(self, record, sign):
+        if not isinstance(record, dict):
+            raise TypeError(f"transaction record must be a dict, not {type(record).__name__}")
+        return self.changes(record['amount'], record['type'], record['date'],
+                            record['category'], record.get('account', 'default'), sign)
+
+    # Work out which cells a transaction touches, without changing anything
+    # Returns: list of (cell key, income, expenses, count) to add
+    def changes(self, amount, tx_type, day, category, account, sign):
+        if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+            raise TypeError(f"amount must be a number, not {type(amount).__name__}")
+        if tx_type not in ('income', 'expense'):
+            raise ValueError(f"unknown transaction type: {tx_type!r}")
+        income = amount if tx_type == 'income' else 0
+        expense = amount if tx_type == 'expense' else 0
+        return [((level, period, cat, acc), sign * income, sign * expense, sign)
+                for level, period in period_keys(day).items()
+                for cat in (category, ALL)
+                for acc in (account, ALL)]
+
+    def apply(self, steps):
+        totals = {}
+        for key, income, expense, count in steps:
+            total = totals.setdefault(key, [0, 0, 0])
+            total[0] += income
+            total[1] += expense
+            total[2] += count
+        # check everything first so a bad removal leaves the cube untouched
+        for key, total in totals.items():
+            cell = self.cells.get(key, (0, 0, 0))
+            if (cell[2] + total[2] < 0 or cell[0] + total[0] < -TOLERANCE
+                    or cell[1] + total[1] < -TOLERANCE):
+                raise ValueError(f"transaction is not in the rollups for {key[1]} "
+                                 f"(category {key[2]!r}, account {key[3]!r})")
+        for key, total in totals.items():
+            cell = self.cells.setdefault(key, [0, 0, 0])
+            cell[0] += total[0]
+            cell[1] += total[1]
+            cell[2] += total[2]
+            if cell[2] == 0 and abs(cell[0]) <= TOLERANCE and abs(cell[1]) <= TOLERANCE:
+                # nothing left in this period, don't keep empty cells
+                del self.cells[key]
+
+    '''
+        Get the totals of one period
+        Returns: dict with income, expenses, balance and count
+    '''
+    def get(self, level, period, category=ALL, account=ALL):
+        income, expenses, count = self.cells.get((level, period, category, account), (0, 0, 0))
+        return {'income': income, 'expenses': expenses, 'balance': income - expenses, 'count': count}
+
+    '''
+        Get the totals of every stored period of a level, oldest first
+        start and end are period keys of that level and are both included
+        Returns: list of (period, totals) pairs
+    '''
+    def series(self, level, start=None, end=None, category=ALL, account=ALL):
+        periods = sorted(period for lvl, period, cat, acc in self.cells
+                         if lvl == level and cat == category and acc == account
+                         and (start is None or period >= start)
+                         and (end is None or period <= end))
+        return [(period, self.get(level, period, category, account)) for period in periods]
+
+    # Compare a month or year with the same period one year earlier
+    def year_over_year(self, period, category=ALL, account=ALL):
+        level = 'year' if len(period) == 4 else 'month'
+        previous = str(int(period[:4]) - 1) + period[4:]
+        current = self.get(level, period, category, account)
+        before = self.get(level, previous, category, account)
+        change = None
+        if before['expenses']:
+            change = (current['expenses'] - before['expenses']) / before['expenses']
+        return {'period': period, 'current': current, 'previous': before,
+                'expense_change': change}
+
+    # Get the cells as rows of [level, period, category, account, income, expenses, count]
+    def to_rows(self):
+        return [list(key) + list(value) for key, value in self.cells.items()]
+
+    @classmethod
+    def from_rows(cls, rows):
+        cube = cls()
+        cube.cells = {tuple(row[:4]): list(row[4:]) for row in rows}
+        return cube
+
+    # Save the rollups next to the ledger file
+    def save(self, filename):
+        with open(filename, 'w') as f:
+            json.dump(self.to_rows(), f)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename) as f:
+            return cls.from_rows(json.load(f))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# python3 version v3.12.2 via conda
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from rollups import ALL
+
+# What-if cashflow projections, e.g. "what happens to my balance if I cut
+# Food by 20% and rent rises 5%". Monthly income and spending per category
+# are drawn from the history in the rollups, adjusted by the scenario, and
+# simulated for thousands of paths at once with NumPy.
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+'''
+    Get the average and spread of monthly income and of monthly spending
+    per category from the month rollups
+    end is the last month to use (e.g. '2026-09'), so an unfinished current
+    month can be left out
+    Returns: dict with 'income' (mean, std) and 'expenses' {category: (mean, std)}
+'''
+def baseline_from_rollups(cube, account=ALL, end=None):
+    stored = [period for period, _ in cube.series('month', end=end, account=account)]
+    if not stored:
+        return {'income': (0.0, 0.0), 'expenses': {}}
+    # every calendar month from the first to the last, empty ones count as 0
+    first = int(stored[0][:4]) * 12 + int(stored[0][5:]) - 1
+    last = int(stored[-1][:4]) * 12 + int(stored[-1][5:]) - 1
+    months = [f'{month // 12}-{month % 12 + 1:02d}' for month in range(first, last + 1)]
+    categories = sorted({cat for level, _, cat, acc in cube.cells
+                         if level == 'month' and acc == account and cat != ALL})
+    income = [cube.get('month', month, ALL, account)['income'] for month in months]
+    expenses = {}
+    for category in categories:
+        # a month without spending in a category counts as 0 for that category
+        spent = [cube.get('month', month, category, account)['expenses'] for month in months]
+        if any(spent):
+            expenses[category] = (float(np.mean(spent)), float(np.std(spent)))
+    return {'income': (float(np.mean(income)), float(np.std(income))), 'expenses': expenses}
+
+
+'''
+    Run a Monte Carlo projection of the balance for one scenario
+    adjustments maps a category (or 'Income') to a relative change,
+    e.g. {'Food': -0.20, 'Bills': 0.05}
+    Returns: dict with the percentile bands of the balance for every month
+'''
+def simulate(baseline, adjustments=None, start_balance=0.0, months=12, paths=5000,
+             seed=None, percentiles=PERCENTILES):
+    adjustments = adjustments or {}
+    categories = list(baseline['expenses'])
+    for key, change in adjustments.items():
+        if key != 'Income' and key not in baseline['expenses']:
+            raise ValueError(f"unknown category in scenario: {key!r} "
+                             f"(known: {', '.join(categories + ['Income'])})")
+        if change < -1:
+            raise ValueError(f"{key} can't drop by more than 100%: {change}")
+    if months < 1 or paths < 1:
+        raise ValueError("months and paths must be at least 1")
+    rng = np.random.default_rng(seed)
+
+    means = np.array([baseline['expenses'][cat][0] for cat in categories], dtype=float)
+    stds = np.array([baseline['expenses'][cat][1] for cat in categories], dtype=float)
+    factors = np.array([1 + adjustments.get(cat, 0) for cat in categories], dtype=float)
+
+    # (paths, months, categories); spending can't go below zero
+    spending = rng.normal(means * factors, stds * factors, size=(paths, months, len(categories)))
+    spending = np.clip(spending, 0, None).sum(axis=2)
+
+    income_mean, income_std = baseline['income']
+    income_factor = 1 + adjustments.get('Income', 0)
+    income = rng.normal(income_mean * income_factor, income_std * income_factor,
+                        size=(paths, months))
+    income = np.clip(income, 0, None)
+
+    balances = start_balance + np.cumsum(income - spending, axis=1)
+    bands = np.percentile(balances, percentiles, axis=0)
+    return {
+        'adjustments': adjustments,
+        'months': months,
+        'bands': {p: band.tolist() for p, band in zip(percentiles, bands)},
+        'final_median': float(np.median(balances[:, -1])),
+        'chance_negative': float((balances[:, -1] < 0).mean()),
+    }
+
+
+def simulate_args(args):
+    return simulate(*args)
+
+
+'''
+    Run many scenarios, spread over a process pool
+    Returns: list of results in the same order as scenarios
+'''
+def run_sweep(baseline, scenarios, start_balance=0.0, months=12, paths=5000,
+              seed=None, workers=None):
+    # independent random streams so results don't depend on which process ran them
+    seeds = np.random.SeedSequence(seed).spawn(len(scenarios))
+    jobs = [(baseline, adjustments, start_balance, months, paths, child)
+            for adjustments, child in zip(scenarios, seeds)]
+    if workers == 1 or len(jobs) <= 1:
+        return [simulate_args(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(simulate_args, jobs))
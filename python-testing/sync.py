@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# python3 version v3.12.2 via conda
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Delta sync between a client's local storage (e.g. the React prototype's
+# `window.storage`) and the Python core. Instead of re-sending the whole
+# transactions array on every add or delete, each client keeps a list of
+# pending changes keyed by transaction id and only sends those. The server
+# answers with the changes it has seen since the client's last cursor, so
+# the cost of a sync grows with the number of changes, not the ledger size.
+#
+# Every change carries a version vector ({client_id: counter}) so the server
+# can tell a newer edit from a stale one, and detect two clients editing the
+# same transaction without having seen each other's edit.
+
+
+# Compare two version vectors
+# Returns: 'equal', 'before' (a happened before b), 'after' or 'concurrent'
+def compare_versions(a, b):
+    a_ahead = any(count > b.get(client, 0) for client, count in a.items())
+    b_ahead = any(count > a.get(client, 0) for client, count in b.items())
+    if a_ahead and b_ahead:
+        return 'concurrent'
+    if a_ahead:
+        return 'after'
+    if b_ahead:
+        return 'before'
+    return 'equal'
+
+
+# Combine two version vectors, keeping the highest counter for every client
+def merge_versions(a, b):
+    merged = dict(a)
+    for client, count in b.items():
+        if count > merged.get(client, 0):
+            merged[client] = count
+    return merged
+
+
+class SyncEngine:
+    def __init__(self, rollups=None):
+        # latest record for each transaction id (deleted ones are kept as
+        # tombstones so the delete can still be handed to other clients)
+        self.ledger = {}
+        # change log in the order the server accepted changes;
+        # the cursor a client holds is simply a position in this list
+        self.log = []
+        # position in the log of the latest change for each transaction id
+        self.latest = {}
+        # optional RollupCube kept up to date as changes are accepted
+        self.rollups = rollups
+        self.lock = threading.Lock()
+
+    # Get the cursor a client should send on its next sync
+    def get_cursor(self):
+        return len(self.log)
+
+    # Get the live (non-deleted) transactions
+    def get_transactions(self):
+        return {tx_id: change['record'] for tx_id, change in self.ledger.items()
+                if not change['deleted']}
+
+    # Accept a list of changes from a client and return the changes it has
+    # not seen yet, starting from its cursor
+    def sync(self, client_id, cursor, changes):
+        with self.lock:
+            conflicts = []
+            # changes that can't be applied are turned away one at a time,
+            # the rest of the batch still goes through
+            rejected = []
+            for change in changes:
+                try:
+                    result = self.apply_change(change)
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    rejected.append(str(change.get('id')) if isinstance(change, dict) else None)
+                    continue
+                if result == 'conflict':
+                    conflicts.append(str(change['id']))
+            return {
+                'cursor': self.get_cursor(),
+                'changes': self.changes_since(cursor, client_id),
+                'conflicts': conflicts,
+                'rejected': rejected,
+            }
+
+    '''
+        Apply a single change to the ledger
+        Returns: 'applied', 'stale' or 'conflict'
+    '''
+    def apply_change(self, change):
+        tx_id = str(change['id'])
+        incoming = {
+            'id': tx_id,
+            'version': dict(change['version']),
+            'deleted': bool(change.get('deleted', False)),
+            'record': change.get('record'),
+            'origin': change['origin'],
+        }
+        current = self.ledger.get(tx_id)
+        result = 'applied'
+        if current is not None:
+            order = compare_versions(incoming['version'], current['version'])
+            if order in ('before', 'equal'):
+                return 'stale'
+            if order == 'concurrent':
+                # both sides edited without seeing each other: pick the same
+                # winner on every node (highest origin id) and merge both versions
+                result = 'conflict'
+                version = merge_versions(incoming['version'], current['version'])
+                if current['origin'] > incoming['origin']:
+                    incoming = dict(current)
+                incoming['version'] = version
+                # neither client has this version yet, so it has to go back
+                # to both of them, including the one it originally came from
+                incoming['merged'] = True
+        if self.rollups is not None:
+            # raises before anything changes if the new record is invalid
+            self.rollups.replace_record(
+                None if current is None or current['deleted'] else current['record'],
+                None if incoming['deleted'] else incoming['record'])
+        self.ledger[tx_id] = incoming
+        self.record(incoming)
+        return result
+
+    # Append a change to the log and drop the entry it replaces
+    def record(self, change):
+        previous = self.latest.get(change['id'])
+        if previous is not None:
+            self.log[previous] = None
+        self.latest[change['id']] = len(self.log)
+        self.log.append(change)
+
+    # Get every change after the cursor, skipping the ones a client sent itself
+    # (unless the server merged their version while resolving a conflict)
+    def changes_since(self, cursor, client_id=None):
+        cursor = max(0, min(cursor, len(self.log)))
+        return [change for change in self.log[cursor:]
+                if change is not None
+                and (change['origin'] != client_id or change.get('merged'))]
+
+
+class SyncRequestHandler(BaseHTTPRequestHandler):
+    engine = None
+
+    def do_POST(self):
+        if self.path != '/sync':
+            self.send_error(404)
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            response = self.engine.sync(body['client_id'], int(body.get('cursor', 0)),
+                                        body.get('changes', []))
+        except (ValueError, KeyError, TypeError) as error:
+            self.send_error(400, str(error))
+            return
+        payload = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    # keep the terminal clean while the CLI is in use
+    def log_message(self, format, *args):
+        pass
+
+
+'''
+    Create the HTTP sync endpoint (POST /sync) for an engine
+    Returns: server that can be started with serve_forever()
+'''
+def make_server(engine, host='127.0.0.1', port=8765):
+    handler = type('BoundSyncRequestHandler', (SyncRequestHandler,), {'engine': engine})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+class SyncClient:
+    def __init__(self, client_id, url='http://127.0.0.1:8765/sync'):
+        self.client_id = client_id
+        self.url = url
+        self.cursor = 0
+        self.counter = 0
+        self.transactions = {}
+        self.versions = {}
+        # changes made locally that the server has not received yet
+        self.pending = {}
+        # ids of the changes the server refused on the last sync
+        self.rejected = []
+
+    # Add or edit a transaction locally
+    def put(self, tx):
+        tx_id = str(tx['id'])
+        self.transactions[tx_id] = dict(tx)
+        self.queue_change(tx_id, dict(tx), deleted=False)
+
+    # Delete a transaction locally
+    def delete(self, tx_id):
+        tx_id = str(tx_id)
+        self.transactions.pop(tx_id, None)
+        self.queue_change(tx_id, None, deleted=True)
+
+    def queue_change(self, tx_id, record, deleted):
+        self.counter += 1
+        version = dict(self.versions.get(tx_id, {}))
+        version[self.client_id] = self.counter
+        self.versions[tx_id] = version
+        # only the latest change per transaction needs to be sent
+        self.pending[tx_id] = {
+            'id': tx_id,
+            'version': version,
+            'deleted': deleted,
+            'record': record,
+            'origin': self.client_id,
+        }
+
+    # Send pending changes and apply whatever the server has for us
+    def sync(self):
+        request = {
+            'client_id': self.client_id,
+            'cursor': self.cursor,
+            'changes': list(self.pending.values()),
+        }
+        response = self.send(request)
+        self.pending = {}
+        self.rejected = response['rejected']
+        for change in response['changes']:
+            self.apply_remote(change)
+        self.cursor = response['cursor']
+        return response
+
+    def send(self, request):
+        data = json.dumps(request).encode()
+        http_request = urllib.request.Request(
+            self.url, data=data, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(http_request) as response:
+            return json.loads(response.read())
+
+    def apply_remote(self, change):
+        tx_id = change['id']
+        self.versions[tx_id] = merge_versions(self.versions.get(tx_id, {}), change['version'])
+        if change['deleted']:
+            self.transactions.pop(tx_id, None)
+        else:
+            self.transactions[tx_id] = change['record']
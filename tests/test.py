@@ -406,6 +406,56 @@ class TestRemoveExpense:
         assert tracker.expenses == 100.0
 
 
+    def test_remove_expense_with_wrong_category_is_rejected(self):
+        # Arrange
+        tracker = BudgetTracker()
+        tracker.add_expense(100.0, "Food", "2026-01-17")
+
+        # Act
+        tracker.remove_expense(100.0, "Bills", "2026-01-17")
+
+        # Assert
+        assert tracker.expenses == 100.0
+        assert tracker.get_tx_count() == 1
+        assert tracker.rollups.get("day", "2026-01-17", "Bills")["count"] == 0
+
+    def test_remove_expense_from_income_is_rejected(self):
+        # Arrange
+        tracker = BudgetTracker()
+        tracker.add_income(100.0, "Salary", "2026-01-02")
+
+        # Act
+        tracker.remove_expense(50.0, "Salary", "2026-01-02")
+
+        # Assert
+        assert tracker.expenses == 0
+        assert tracker.rollups.get("day", "2026-01-02")["income"] == 100.0
+        assert tracker.rollups.get("day", "2026-01-02")["expenses"] == 0
+
+    @pytest.mark.parametrize(
+        "added, removed",
+        [
+            pytest.param([100.0], 30.0, id="partial_removal"),
+            pytest.param([100.0], 100.0, id="full_removal"),
+            pytest.param([100.0, 50.0, 25.0], 30.0, id="removal_after_several"),
+        ],
+    )
+    def test_remove_expense_keeps_rollups_in_step(self, added, removed):
+        # Arrange
+        tracker = BudgetTracker()
+        for amount in added:
+            tracker.add_expense(amount, "Food", "2026-01-17")
+
+        # Act
+        tracker.remove_expense(removed, "Food", "2026-01-17")
+
+        # Assert
+        for level, period in (("day", "2026-01-17"), ("year", "2026")):
+            totals = tracker.rollups.get(level, period, "Food")
+            assert totals["expenses"] == pytest.approx(tracker.expenses)
+            assert totals["count"] == tracker.get_tx_count()
+
+
 # ==================== Budget Calculation Tests ====================
 
 class TestViewBudget:
@@ -455,6 +505,41 @@ class TestViewBudget:
         assert (tracker.income - tracker.expenses) == expected_balance
 
 
+class TestImportExpenses:
+    def test_import_expenses_updates_totals_rollups_and_alerts(self):
+        # Arrange
+        tracker = BudgetTracker()
+        history = [(f"2026-01-{day:02d}", 10.0 + day % 3) for day in range(1, 21)]
+        history.append(("2026-01-25", 500.0))
+
+        # Act
+        alerts = tracker.import_expenses(history, "Food")
+
+        # Assert
+        assert [alert["amount"] for alert in alerts] == [500.0]
+        assert tracker.get_alerts() == alerts
+        assert tracker.get_tx_count() == 21
+        assert tracker.expenses == pytest.approx(sum(amount for _, amount in history))
+        assert tracker.rollups.get("month", "2026-01", "Food")["expenses"] == pytest.approx(tracker.expenses)
+
+
+class TestSimulateBudget:
+    def test_simulate_budget_leaves_out_current_month(self):
+        # Arrange
+        tracker = BudgetTracker()
+        tracker.add_income(3000.0, "Income", "2025-01-01")
+        tracker.add_expense(1000.0, "Bills", "2025-01-05")
+        # a partial current month with income not in yet
+        tracker.add_expense(500.0, "Bills")
+
+        # Act
+        result = tracker.simulate_budget(months=12, paths=1000)
+
+        # Assert
+        # 1500 + 12 * (3000 - 1000)
+        assert result["final_median"] == pytest.approx(25500.0)
+
+
 # ==================== State Management Tests ====================
 
 class TestUserField:
@@ -0,0 +1,189 @@
+import random
+
+import numpy as np
+import pytest
+
+from anomaly import AnomalyDetector, P2Quantile, RunningStats
+
+
+class TestRunningStats:
+    def test_push_matches_numpy(self):
+        # Arrange
+        values = [12.5, 30.0, 7.25, 18.0, 22.75]
+        stats = RunningStats()
+
+        # Act
+        for value in values:
+            stats.push(value)
+
+        # Assert
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.get_variance() == pytest.approx(np.var(values, ddof=1))
+
+    def test_push_many_matches_push(self):
+        # Arrange
+        one_by_one = RunningStats()
+        batched = RunningStats()
+        for value in (5.0, 6.0, 7.0):
+            one_by_one.push(value)
+            batched.push(value)
+
+        # Act
+        for value in (20.0, 1.0, 13.5):
+            one_by_one.push(value)
+        batched.push_many([20.0, 1.0, 13.5])
+
+        # Assert
+        assert batched.count == one_by_one.count
+        assert batched.mean == pytest.approx(one_by_one.mean)
+        assert batched.get_variance() == pytest.approx(one_by_one.get_variance())
+
+    def test_single_value_has_no_variance(self):
+        stats = RunningStats()
+        stats.push(10.0)
+        assert stats.get_std() == 0.0
+
+
+class TestP2Quantile:
+    @pytest.mark.parametrize("p", [0.5, 0.9, 0.99])
+    def test_estimate_is_close_to_exact_quantile(self, p):
+        # Arrange
+        rng = random.Random(42)
+        values = [rng.gauss(50.0, 10.0) for _ in range(20000)]
+        estimator = P2Quantile(p)
+
+        # Act
+        for value in values:
+            estimator.push(value)
+
+        # Assert
+        assert estimator.get_value() == pytest.approx(np.quantile(values, p), rel=0.02)
+
+    def test_empty_estimator_has_no_value(self):
+        assert P2Quantile(0.5).get_value() is None
+
+
+class TestAnomalyDetector:
+    def test_no_alerts_without_history(self):
+        detector = AnomalyDetector()
+        assert detector.observe("Food", 5000.0) is None
+
+    def test_flags_large_expense(self):
+        # Arrange
+        detector = AnomalyDetector()
+        for amount in (10.0, 12.0, 11.0, 9.0, 13.0, 10.5, 11.5, 12.5, 9.5, 10.0, 11.0):
+            detector.observe("Food", amount)
+
+        # Act
+        alert = detector.observe("Food", 250.0)
+
+        # Assert
+        assert alert is not None
+        assert alert["category"] == "Food"
+        assert alert["z_score"] > 3.0
+
+    def test_categories_are_scored_separately(self):
+        # Arrange
+        detector = AnomalyDetector()
+        for _ in range(12):
+            detector.observe("Food", 10.0 + random.random())
+            detector.observe("Bills", 1500.0 + random.random())
+
+        # Act & Assert
+        assert detector.observe("Bills", 1500.5) is None
+        assert detector.observe("Food", 1500.5) is not None
+
+    def test_score_batch_matches_score(self):
+        # Arrange
+        detector = AnomalyDetector(min_samples=2)
+        detector.import_history("Food", [10.0, 20.0, 30.0])
+        amounts = [5.0, 25.0, 100.0]
+
+        # Act
+        result = detector.score_batch("Food", amounts)
+
+        # Assert
+        assert result == pytest.approx([detector.score("Food", amount) for amount in amounts])
+
+    def test_import_history_flags_outliers(self):
+        # Arrange
+        rng = np.random.default_rng(0)
+        history = list(rng.normal(40.0, 5.0, size=500)) + [400.0]
+        detector = AnomalyDetector()
+
+        # Act
+        alerts = detector.import_history("Transport", history)
+
+        # Assert
+        assert 400.0 in [alert["amount"] for alert in alerts]
+        assert detector.get_category("Transport").stats.count == 501
+
+    def test_import_history_outlier_does_not_hide_itself(self):
+        # Arrange
+        detector = AnomalyDetector(min_samples=5)
+        history = [10.0, 11.0, 9.0, 10.5, 9.5, 10.0, 11.0, 9.0, 1000.0]
+
+        # Act
+        alerts = detector.import_history("Food", history)
+
+        # Assert
+        assert [alert["amount"] for alert in alerts] == [1000.0]
+        assert alerts[0]["mean"] == pytest.approx(10.0)
+
+    @pytest.mark.parametrize("n", [30, 100, 1000])
+    def test_false_positive_rate_on_normal_data_is_low(self, n):
+        # Arrange
+        rng = np.random.default_rng(5)
+        detector = AnomalyDetector()
+        flagged = 0
+
+        # Act
+        for _ in range(20):
+            detector.categories = {}
+            for amount in rng.normal(50.0, 10.0, size=n):
+                flagged += detector.observe("Food", float(amount)) is not None
+
+        # Assert
+        assert flagged / (20 * n) < 0.01
+
+    def test_fixed_charge_history_flags_any_jump(self):
+        # Arrange
+        detector = AnomalyDetector()
+        for _ in range(30):
+            detector.observe("Rent", 1500.0)
+
+        # Act & Assert
+        assert detector.observe("Rent", 1510.0) is None
+        assert detector.observe("Rent", 15000.0) is not None
+
+    def test_fixed_charge_import_uses_same_tolerance(self):
+        # Arrange
+        detector = AnomalyDetector()
+        streaming = AnomalyDetector()
+        history = [9.99] * 20 + [10.05]
+        for amount in history:
+            streaming.observe("Subscriptions", amount)
+
+        # Act
+        alerts = detector.import_history("Subscriptions", history + [999.0])
+
+        # Assert
+        assert [alert["amount"] for alert in alerts] == [999.0]
+        assert alerts[0]["z_score"] == pytest.approx(streaming.score("Subscriptions", 999.0))
+
+    def test_quantile_flags_amount_below_z_threshold(self):
+        # Arrange
+        rng = np.random.default_rng(3)
+        detector = AnomalyDetector()
+        for amount in rng.normal(50.0, 10.0, size=100):
+            detector.observe("Food", float(amount))
+        stats = detector.get_category("Food").stats
+        amount = stats.mean + 2.8 * stats.get_std()
+
+        # Act
+        alert = detector.observe("Food", amount)
+
+        # Assert
+        assert alert is not None
+        assert 2.5 < alert["z_score"] < 3.0
+        assert amount > alert["quantile"]
@@ -0,0 +1,196 @@
+import pytest
+
+from rollups import ALL, RollupCube, period_keys
+from sync import SyncEngine
+
+
+def make_tx(tx_id, amount, day, category="Food", tx_type="expense"):
+    return {"id": tx_id, "version": {"a": tx_id}, "origin": "a",
+            "record": {"amount": amount, "type": tx_type, "date": day, "category": category}}
+
+
+class TestPeriodKeys:
+    @pytest.mark.parametrize(
+        "day, expected",
+        [
+            pytest.param("2026-01-17", {"day": "2026-01-17", "week": "2026-W03",
+                                        "month": "2026-01", "year": "2026"}, id="mid_january"),
+            pytest.param("2027-01-01", {"day": "2027-01-01", "week": "2026-W53",
+                                        "month": "2027-01", "year": "2027"}, id="iso_week_of_previous_year"),
+        ],
+    )
+    def test_period_keys(self, day, expected):
+        assert period_keys(day) == expected
+
+
+class TestRollupCube:
+    def test_add_updates_every_level(self):
+        # Arrange
+        cube = RollupCube()
+
+        # Act
+        cube.add(12.5, "expense", "2026-01-17", "Food")
+        cube.add(7.5, "expense", "2026-01-18", "Food")
+        cube.add(1000.0, "income", "2026-01-18", "Income")
+
+        # Assert
+        assert cube.get("day", "2026-01-17", "Food")["expenses"] == 12.5
+        assert cube.get("week", "2026-W03", "Food")["expenses"] == 20.0
+        assert cube.get("month", "2026-01")["balance"] == 980.0
+        assert cube.get("year", "2026")["count"] == 3
+
+    def test_totals_per_account(self):
+        # Arrange
+        cube = RollupCube()
+
+        # Act
+        cube.add(40.0, "expense", "2026-02-01", "Bills", "checking")
+        cube.add(60.0, "expense", "2026-02-01", "Bills", "credit")
+
+        # Assert
+        assert cube.get("month", "2026-02", "Bills", "credit")["expenses"] == 60.0
+        assert cube.get("month", "2026-02", ALL, "checking")["expenses"] == 40.0
+        assert cube.get("month", "2026-02", "Bills")["expenses"] == 100.0
+
+    def test_remove_drops_empty_cells(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(12.5, "expense", "2026-01-17", "Food")
+
+        # Act
+        cube.remove(12.5, "expense", "2026-01-17", "Food")
+
+        # Assert
+        assert cube.cells == {}
+
+    def test_series_is_sorted_and_filtered(self):
+        # Arrange
+        cube = RollupCube()
+        for month in (3, 1, 2, 12):
+            cube.add(float(month), "expense", f"2025-{month:02d}-10", "Food")
+
+        # Act
+        result = cube.series("month", start="2025-02", end="2025-06")
+
+        # Assert
+        assert [period for period, _ in result] == ["2025-02", "2025-03"]
+
+    def test_year_over_year(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(200.0, "expense", "2025-03-10", "Food")
+        cube.add(250.0, "expense", "2026-03-02", "Food")
+
+        # Act
+        result = cube.year_over_year("2026-03", "Food")
+
+        # Assert
+        assert result["previous"]["expenses"] == 200.0
+        assert result["expense_change"] == pytest.approx(0.25)
+
+    def test_remove_missing_transaction_is_rejected(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(12.5, "expense", "2026-01-17", "Food")
+        before = {key: list(value) for key, value in cube.cells.items()}
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            cube.remove(5.0, "expense", "2026-01-18", "Food")
+        assert cube.cells == before
+
+    def test_remove_wrong_type_is_rejected(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(100.0, "income", "2026-01-02", "Salary")
+        before = {key: list(value) for key, value in cube.cells.items()}
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            cube.remove(50.0, "expense", "2026-01-02", "Salary")
+        assert cube.cells == before
+
+    def test_remove_more_than_recorded_is_rejected(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(20.0, "expense", "2026-01-17", "Food")
+        cube.add(30.0, "expense", "2026-01-17", "Food")
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            cube.remove(60.0, "expense", "2026-01-17", "Food")
+
+    def test_partial_removal_keeps_remaining_totals(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(100.0, "expense", "2026-01-17", "Food")
+
+        # Act
+        cube.remove(30.0, "expense", "2026-01-17", "Food")
+
+        # Assert
+        assert cube.get("day", "2026-01-17", "Food") == {
+            "income": 0, "expenses": 70.0, "balance": -70.0, "count": 0}
+
+    def test_save_and_load_unusual_keys(self, tmp_path):
+        # Arrange
+        cube = RollupCube()
+        cube.add(12.5, "expense", "2026-01-17", "Food|Drink", 42)
+        filename = tmp_path / "rollups.json"
+
+        # Act
+        cube.save(filename)
+        loaded = RollupCube.load(filename)
+
+        # Assert
+        assert loaded.cells == cube.cells
+        assert loaded.series("month", category="Food|Drink", account=42)[0][1]["expenses"] == 12.5
+
+    def test_save_and_load(self, tmp_path):
+        # Arrange
+        cube = RollupCube()
+        cube.add(12.5, "expense", "2026-01-17", "Food")
+        filename = tmp_path / "rollups.json"
+
+        # Act
+        cube.save(filename)
+        loaded = RollupCube.load(filename)
+
+        # Assert
+        assert loaded.cells == cube.cells
+
+
+class TestSyncRollups:
+    def test_sync_engine_keeps_rollups_up_to_date(self):
+        # Arrange
+        cube = RollupCube()
+        engine = SyncEngine(rollups=cube)
+        engine.sync("a", 0, [make_tx(1, 10.0, "2026-01-17"), make_tx(2, 5.0, "2026-01-20")])
+
+        # Act
+        edit = make_tx(1, 15.0, "2026-01-17")
+        edit["version"] = {"a": 3}
+        delete = {"id": 2, "version": {"a": 4}, "origin": "a", "deleted": True}
+        engine.sync("a", 0, [edit, delete])
+
+        # Assert
+        assert cube.get("month", "2026-01", "Food")["expenses"] == 15.0
+        assert cube.get("month", "2026-01", "Food")["count"] == 1
+
+    def test_invalid_edit_leaves_rollups_and_ledger_unchanged(self):
+        # Arrange
+        cube = RollupCube()
+        engine = SyncEngine(rollups=cube)
+        engine.sync("a", 0, [make_tx(1, 10.0, "2026-01-17")])
+        before = {key: list(value) for key, value in cube.cells.items()}
+        edit = make_tx(1, 15.0, "2026-01-17")
+        edit["version"] = {"a": 2}
+        del edit["record"]["category"]
+
+        # Act
+        response = engine.sync("a", 0, [edit])
+
+        # Assert
+        assert response["rejected"] == ["1"]
+        assert cube.cells == before
+        assert engine.get_transactions()["1"]["amount"] == 10.0
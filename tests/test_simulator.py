@@ -0,0 +1,147 @@
+import time
+
+import pytest
+
+from rollups import RollupCube
+from simulator import PERCENTILES, baseline_from_rollups, run_sweep, simulate
+
+
+@pytest.fixture
+def baseline():
+    return {"income": (3000.0, 100.0),
+            "expenses": {"Food": (500.0, 50.0), "Bills": (1500.0, 0.0)}}
+
+
+class TestBaselineFromRollups:
+    def test_monthly_means_per_category(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(3000.0, "income", "2026-01-01", "Income")
+        cube.add(3000.0, "income", "2026-02-01", "Income")
+        cube.add(400.0, "expense", "2026-01-05", "Food")
+        cube.add(600.0, "expense", "2026-02-05", "Food")
+        cube.add(100.0, "expense", "2026-02-09", "Shopping")
+
+        # Act
+        result = baseline_from_rollups(cube)
+
+        # Assert
+        assert result["income"] == (3000.0, 0.0)
+        assert result["expenses"]["Food"] == (500.0, 100.0)
+        # no shopping in January counts as 0 for that month
+        assert result["expenses"]["Shopping"] == (50.0, 50.0)
+
+    def test_months_without_transactions_count_as_zero(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(3000.0, "income", "2026-01-01", "Income")
+        cube.add(50.0, "expense", "2026-03-10", "Food")
+        cube.add(3000.0, "income", "2026-06-01", "Income")
+
+        # Act
+        result = baseline_from_rollups(cube)
+
+        # Assert
+        assert result["income"][0] == pytest.approx(1000.0)
+        assert result["expenses"]["Food"][0] == pytest.approx(50.0 / 6)
+
+    def test_months_across_years(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(1200.0, "income", "2025-11-01", "Income")
+        cube.add(1200.0, "income", "2026-02-01", "Income")
+
+        # Act
+        result = baseline_from_rollups(cube)
+
+        # Assert
+        assert result["income"][0] == pytest.approx(600.0)
+
+    def test_months_after_end_are_left_out(self):
+        # Arrange
+        cube = RollupCube()
+        cube.add(3000.0, "income", "2026-08-01", "Income")
+        cube.add(3000.0, "income", "2026-09-01", "Income")
+        cube.add(400.0, "expense", "2026-09-12", "Food")
+        # the unfinished current month
+        cube.add(80.0, "expense", "2026-10-02", "Food")
+
+        # Act
+        result = baseline_from_rollups(cube, end="2026-09")
+
+        # Assert
+        assert result["income"] == (3000.0, 0.0)
+        assert result["expenses"]["Food"] == (200.0, 200.0)
+
+    def test_empty_rollups(self):
+        assert baseline_from_rollups(RollupCube()) == {"income": (0.0, 0.0), "expenses": {}}
+
+
+class TestSimulate:
+    def test_bands_cover_every_month_in_order(self, baseline):
+        # Act
+        result = simulate(baseline, start_balance=1000.0, months=24, paths=2000, seed=1)
+
+        # Assert
+        assert set(result["bands"]) == set(PERCENTILES)
+        for month in range(24):
+            column = [result["bands"][p][month] for p in PERCENTILES]
+            assert column == sorted(column)
+
+    def test_median_follows_expected_cashflow(self, baseline):
+        # Act
+        result = simulate(baseline, start_balance=1000.0, months=12, paths=5000, seed=1)
+
+        # Assert
+        # 1000 + 12 * (3000 - 500 - 1500)
+        assert result["final_median"] == pytest.approx(13000.0, rel=0.02)
+
+    def test_adjustments_change_spending(self, baseline):
+        # Act
+        result = simulate(baseline, {"Food": -0.20, "Bills": 0.05}, months=12, seed=1)
+
+        # Assert
+        # 12 * (3000 - 400 - 1575)
+        assert result["final_median"] == pytest.approx(12300.0, rel=0.02)
+
+    def test_same_seed_gives_same_result(self, baseline):
+        assert simulate(baseline, seed=7) == simulate(baseline, seed=7)
+
+    def test_large_run_finishes_quickly(self, baseline):
+        # Act
+        start = time.perf_counter()
+        simulate(baseline, months=60, paths=10000, seed=1)
+
+        # Assert
+        assert time.perf_counter() - start < 5
+
+    @pytest.mark.parametrize(
+        "adjustments, months",
+        [
+            pytest.param({"Rent": 0.05}, 12, id="unknown_category"),
+            pytest.param({"Food": -1.5}, 12, id="cut_more_than_everything"),
+            pytest.param({}, 0, id="zero_months"),
+        ],
+    )
+    def test_invalid_scenarios_raise(self, baseline, adjustments, months):
+        with pytest.raises(ValueError):
+            simulate(baseline, adjustments, months=months)
+
+    def test_income_adjustment_is_allowed(self, baseline):
+        result = simulate(baseline, {"Income": 0.10}, months=12, seed=1)
+        # 12 * (3300 - 500 - 1500)
+        assert result["final_median"] == pytest.approx(15600.0, rel=0.02)
+
+
+class TestRunSweep:
+    def test_pool_matches_inline(self, baseline):
+        # Arrange
+        scenarios = [{}, {"Food": -0.20}, {"Income": 0.10}]
+
+        # Act
+        inline = run_sweep(baseline, scenarios, paths=500, seed=3, workers=1)
+        pooled = run_sweep(baseline, scenarios, paths=500, seed=3, workers=2)
+
+        # Assert
+        assert pooled == inline
+        assert [result["adjustments"] for result in pooled] == scenarios
@@ -0,0 +1,220 @@
+import threading
+
+import pytest
+
+from rollups import RollupCube
+from sync import SyncClient, SyncEngine, compare_versions, make_server, merge_versions
+
+
+# Local stand-in for the sync server, bound to a free port
+@pytest.fixture
+def server():
+    engine = SyncEngine(rollups=RollupCube())
+    httpd = make_server(engine, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/sync"
+    yield engine, url
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_tx(tx_id, amount, description="Lunch"):
+    return {"id": tx_id, "description": description, "amount": amount,
+            "category": "Food", "type": "expense", "date": "2026-01-17"}
+
+
+# ==================== Version Vector Tests ====================
+
+class TestVersionVectors:
+    @pytest.mark.parametrize(
+        "a, b, expected",
+        [
+            pytest.param({"a": 1}, {"a": 1}, "equal", id="equal"),
+            pytest.param({"a": 1}, {"a": 2}, "before", id="before"),
+            pytest.param({"a": 2, "b": 1}, {"a": 2}, "after", id="after"),
+            pytest.param({"a": 2}, {"b": 1}, "concurrent", id="concurrent"),
+        ],
+    )
+    def test_compare_versions(self, a, b, expected):
+        assert compare_versions(a, b) == expected
+
+    def test_merge_versions_keeps_highest_counter(self):
+        assert merge_versions({"a": 3, "b": 1}, {"b": 4, "c": 2}) == {"a": 3, "b": 4, "c": 2}
+
+
+# ==================== Engine Tests ====================
+
+class TestSyncEngine:
+    def test_stale_change_is_ignored(self):
+        # Arrange
+        engine = SyncEngine()
+        engine.sync("a", 0, [{"id": 1, "version": {"a": 2}, "record": make_tx(1, 20.0), "origin": "a"}])
+
+        # Act
+        result = engine.apply_change({"id": 1, "version": {"a": 1}, "record": make_tx(1, 5.0), "origin": "a"})
+
+        # Assert
+        assert result == "stale"
+        assert engine.get_transactions()["1"]["amount"] == 20.0
+
+    def test_changes_since_only_returns_latest_change_per_transaction(self):
+        # Arrange
+        engine = SyncEngine()
+        for counter in range(1, 4):
+            engine.sync("a", 0, [{"id": 1, "version": {"a": counter},
+                                  "record": make_tx(1, float(counter)), "origin": "a"}])
+
+        # Act
+        changes = engine.changes_since(0, "b")
+
+        # Assert
+        assert len(changes) == 1
+        assert changes[0]["record"]["amount"] == 3.0
+
+    def test_changes_since_cursor_skips_older_changes(self):
+        # Arrange
+        engine = SyncEngine()
+        for tx_id in range(100):
+            engine.sync("a", 0, [{"id": tx_id, "version": {"a": tx_id + 1},
+                                  "record": make_tx(tx_id, 1.0), "origin": "a"}])
+        cursor = engine.get_cursor()
+        engine.sync("a", cursor, [{"id": 500, "version": {"a": 101},
+                                   "record": make_tx(500, 9.0), "origin": "a"}])
+
+        # Act
+        changes = engine.changes_since(cursor, "b")
+
+        # Assert
+        assert [change["id"] for change in changes] == ["500"]
+
+
+# ==================== Client/Server Tests ====================
+
+class TestSyncOverHttp:
+    def test_client_only_sends_pending_changes(self, server):
+        # Arrange
+        engine, url = server
+        client = SyncClient("a", url)
+        for tx_id in range(50):
+            client.put(make_tx(tx_id, 1.0))
+        client.sync()
+
+        # Act
+        client.put(make_tx(50, 2.0))
+        request_size = len(client.pending)
+        client.sync()
+
+        # Assert
+        assert request_size == 1
+        assert client.pending == {}
+        assert len(engine.get_transactions()) == 51
+
+    def test_second_client_receives_adds_and_deletes(self, server):
+        # Arrange
+        engine, url = server
+        phone = SyncClient("phone", url)
+        laptop = SyncClient("laptop", url)
+        phone.put(make_tx(1, 12.5))
+        phone.put(make_tx(2, 30.0))
+        phone.sync()
+        laptop.sync()
+
+        # Act
+        phone.delete(1)
+        phone.sync()
+        response = laptop.sync()
+
+        # Assert
+        assert [change["id"] for change in response["changes"]] == ["1"]
+        assert set(laptop.transactions) == {"2"}
+
+    def test_concurrent_edits_converge(self, server):
+        # Arrange
+        engine, url = server
+        phone = SyncClient("phone", url)
+        laptop = SyncClient("laptop", url)
+        phone.put(make_tx(1, 10.0))
+        phone.sync()
+        laptop.sync()
+
+        # Act
+        phone.put(make_tx(1, 11.0, "Phone edit"))
+        laptop.put(make_tx(1, 12.0, "Laptop edit"))
+        phone.sync()
+        response = laptop.sync()
+        phone.sync()
+
+        # Assert
+        assert response["conflicts"] == ["1"]
+        assert phone.transactions == laptop.transactions == engine.get_transactions()
+        assert phone.transactions["1"]["description"] == "Phone edit"
+
+    def test_edit_after_conflict_is_not_a_conflict(self, server):
+        # Arrange
+        engine, url = server
+        phone = SyncClient("phone", url)
+        laptop = SyncClient("laptop", url)
+        phone.put(make_tx(1, 10.0))
+        phone.sync()
+        laptop.sync()
+        phone.put(make_tx(1, 11.0))
+        laptop.put(make_tx(1, 12.0))
+        phone.sync()
+        laptop.sync()
+
+        # Act
+        laptop.put(make_tx(1, 13.0))
+        response = laptop.sync()
+
+        # Assert
+        assert response["conflicts"] == []
+        assert engine.get_transactions()["1"]["amount"] == 13.0
+
+    def test_winner_edit_after_conflict_is_not_a_conflict(self, server):
+        # Arrange
+        engine, url = server
+        a = SyncClient("a", url)
+        z = SyncClient("z", url)
+        z.put(make_tx(1, 10.0))
+        z.sync()
+        a.sync()
+        z.put(make_tx(1, 11.0))
+        z.sync()
+        a.put(make_tx(1, 12.0))
+        a.sync()
+        z.sync()
+
+        # Act
+        z.put(make_tx(1, 13.0))
+        response = z.sync()
+        a.sync()
+
+        # Assert
+        assert response["conflicts"] == []
+        assert engine.get_transactions()["1"]["amount"] == 13.0
+        assert a.transactions == z.transactions == engine.get_transactions()
+
+    def test_invalid_change_is_rejected_alone(self, server):
+        # Arrange
+        engine, url = server
+        a = SyncClient("a", url)
+        b = SyncClient("b", url)
+        a.put(make_tx(1, 10.0))
+        bad = make_tx(2, 5.0)
+        bad["type"] = "transfer"
+        a.put(bad)
+        a.put(make_tx(4, 7.0))
+
+        # Act
+        response = a.sync()
+        b.put(make_tx(3, 20.0))
+        b.sync()
+        a.sync()
+
+        # Assert
+        assert response["rejected"] == ["2"]
+        assert set(engine.get_transactions()) == {"1", "3", "4"}
+        assert "3" in a.transactions
+        assert a.pending == {}
+        assert a.rejected == []